@@ -13,22 +13,32 @@ from __future__ import annotations
 # =========================
 # Standard Library Imports
 # =========================
+import asyncio
+import atexit
 import logging
 import httpx
 import os
+from contextlib import asynccontextmanager
+from logging.handlers import QueueHandler, QueueListener
+from queue import SimpleQueue
 
 # =========================
 # Third-Party Imports
 # =========================
+import orjson
 from dotenv import load_dotenv
-from fastapi import FastAPI, Request
-from fastapi.responses import JSONResponse, StreamingResponse
+from fastapi import APIRouter, FastAPI, Request
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from fastapi.routing import APIRoute
+from typing import Callable
 
 # =========================
 # Campaign: Salon Ibargo
 # =========================
 from salon_ibargo.salon_ibargo_after_call_handler import handle_salon_after_call
 from salon_ibargo.salon_ibargo_actions import (
+    AgendarCitaDisponibilidadIn,
+    CotizarEventoIn,
     agendar_cita_disponibilidad_endpoint,
     cotizar_evento_endpoint,
 )
@@ -53,6 +63,7 @@ from vg_consultoria.vg_consultoria_after_call_handler import (
     handle_vg_consultoria_after_call,
 )
 from vg_consultoria.vg_consultoria_actions import (
+    AgendarCitaDisponibilidadIn as VGAgendarCitaDisponibilidadIn,
     agendar_cita_disponibilidad_endpoint as vg_agendar_cita_endpoint,
 )
 
@@ -64,20 +75,157 @@ from shared.google_oauth import (
     handle_oauth_callback,
 )
 
+# =========================
+# Shared: Google Sheets
+# =========================
+from shared.gsheet_batcher import flush_pending
+from shared.gsheet_utils import warm_sheets_services
+
 # =========================
 # Bootstrap
 # =========================
 
 load_dotenv()
 
+# Route all records through a queue so formatting + stream I/O happen on
+# a background thread instead of blocking the event loop.
+_log_queue = SimpleQueue()
+
+_stream_handler = logging.StreamHandler()
+_stream_handler.setFormatter(
+    logging.Formatter("%(asctime)s | %(levelname)s | %(name)s | %(message)s")
+)
+
+# QueueHandler.prepare() bakes its own formatter into record.msg before
+# the listener runs; keep it pass-through so only the listener-side
+# StreamHandler formats (basicConfig would otherwise attach BASIC_FORMAT
+# and duplicate level/name inside every message).
+_queue_handler = QueueHandler(_log_queue)
+_queue_handler.setFormatter(logging.Formatter("%(message)s"))
+
 logging.basicConfig(
     level=os.getenv("LOG_LEVEL", "INFO"),
-    format="%(asctime)s | %(levelname)s | %(name)s | %(message)s",
+    handlers=[_queue_handler],
 )
 
+_log_listener = QueueListener(
+    _log_queue,
+    _stream_handler,
+    respect_handler_level=True,
+)
+_log_listener.start()
+atexit.register(_log_listener.stop)
+
+logging.raiseExceptions = False
+
 logger = logging.getLogger(__name__)
 
-app = FastAPI()
+
+# =========================
+# orjson Request / Route
+# =========================
+# Request bodies are decoded with orjson (C parser) instead of the
+# stdlib json module used by Starlette's Request.json().
+
+class ORJSONRequest(Request):
+    async def json(self) -> dict:
+        if not hasattr(self, "_json"):
+            self._json = orjson.loads(await self.body())
+        return self._json
+
+
+class ORJSONRoute(APIRoute):
+    def get_route_handler(self) -> Callable:
+        original_route_handler = super().get_route_handler()
+
+        async def custom_route_handler(request: Request):
+            return await original_route_handler(
+                ORJSONRequest(request.scope, request.receive)
+            )
+
+        return custom_route_handler
+
+
+# =========================
+# Concurrency Limit
+# =========================
+# Sheds load with an immediate 503 once MAX_INFLIGHT requests are in
+# flight, instead of queueing new requests behind slow Sheets/LLM I/O.
+# Health probes stay exempt so the platform never marks a busy instance
+# as dead.
+
+class ConnectionLimitMiddleware:
+
+    EXCLUDED_PATHS = {"/", "/health"}
+
+    def __init__(self, app, max_inflight: int = 200):
+        self.app = app
+        self._sem = asyncio.Semaphore(max_inflight)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] in self.EXCLUDED_PATHS:
+            await self.app(scope, receive, send)
+            return
+
+        if self._sem.locked():
+            response = ORJSONResponse(
+                {"error": "server_overloaded"},
+                status_code=503,
+            )
+            await response(scope, receive, send)
+            return
+
+        async with self._sem:
+            await self.app(scope, receive, send)
+
+
+# =========================
+# Lifespan
+# =========================
+# Pre-warm the per-campaign Sheets clients and a shared HTTP pool at
+# startup instead of paying for them on the first real request; flush
+# any queued sheet rows before the process goes away.
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    warm_sheets_services()
+
+    app.state.http = httpx.AsyncClient(
+        limits=httpx.Limits(max_keepalive_connections=20, max_connections=100),
+        timeout=30.0,
+    )
+
+    try:
+        yield
+    finally:
+        await flush_pending()
+        await app.state.http.aclose()
+
+
+app = FastAPI(default_response_class=ORJSONResponse, lifespan=lifespan)
+app.router.route_class = ORJSONRoute
+
+app.add_middleware(
+    ConnectionLimitMiddleware,
+    max_inflight=int(os.environ.get("MAX_INFLIGHT", 200)),
+)
+
+# =========================
+# Static Responses
+# =========================
+# Rendered once at import; Starlette responses with fixed bodies are
+# stateless on send, so the same object can serve every error.
+
+_RECORDING_NOT_FOUND = ORJSONResponse(
+    {"error": "recording_not_found"},
+    status_code=404,
+)
+
+_INTERNAL_ERR = ORJSONResponse(
+    {"error": "internal_server_error"},
+    status_code=500,
+)
+
 
 # =========================
 # General Health
@@ -104,21 +252,20 @@ async def get_recording(call_sid: str):
 
     lookup_url = f"https://api.twilio.com/2010-04-01/Accounts/{account_sid}/Calls/{call_sid}/Recordings.json"
 
-    async with httpx.AsyncClient() as client:
-        lookup = await client.get(lookup_url, auth=(account_sid, auth_token))
+    client = app.state.http
+    lookup = await client.get(lookup_url, auth=(account_sid, auth_token))
 
     recordings = lookup.json().get("recordings", [])
     if not recordings:
-        return JSONResponse(status_code=404, content={"error": "recording_not_found"})
+        return _RECORDING_NOT_FOUND
 
     recording_sid = recordings[0]["sid"]
     mp3_url = f"https://api.twilio.com/2010-04-01/Accounts/{account_sid}/Recordings/{recording_sid}.mp3"
 
-    async with httpx.AsyncClient() as client:
-        response = await client.get(mp3_url, auth=(account_sid, auth_token))
+    response = await client.get(mp3_url, auth=(account_sid, auth_token))
 
     if response.status_code != 200:
-        return JSONResponse(status_code=404, content={"error": "recording_not_found"})
+        return _RECORDING_NOT_FOUND
 
     return StreamingResponse(
         iter([response.content]),
@@ -130,63 +277,76 @@ async def get_recording(call_sid: str):
 # ============================================================
 # CAMPAIGN: SALON IBARGO
 # ============================================================
+# NOTE: public paths are configured in deployed Twilio/agent webhooks,
+# so the routers keep them byte-for-byte identical.
 
 # ----------------------------
 # INBOUND CALL
 # ----------------------------
 
-@app.post("/salon_ibargo/inbound_call")
+salon_ibargo_call_router = APIRouter(
+    prefix="/salon_ibargo",
+    route_class=ORJSONRoute,
+    default_response_class=ORJSONResponse,
+)
+
+
+@salon_ibargo_call_router.post("/inbound_call")
 async def salon_ibargo_inbound_call_route(request: Request):
     return await salon_ibargo_inbound_call(request)
 
 
-@app.post("/salon_ibargo/call/screen")
+@salon_ibargo_call_router.post("/call/screen")
 async def salon_ibargo_screen_route(request: Request):
     return await screen_call(request)
 
 
-@app.post("/salon_ibargo/call/screen_result")
+@salon_ibargo_call_router.post("/call/screen_result")
 async def salon_ibargo_screen_result_route(request: Request):
     return await screen_result(request)
 
 
-@app.post("/salon_ibargo/call/dial_action")
+@salon_ibargo_call_router.post("/call/dial_action")
 async def salon_ibargo_dial_action_route(request: Request):
     return await dial_action(request)
 
 
 # ----------------------------
-# AFTER CALL
+# AFTER CALL + ACTIONS
 # ----------------------------
 
-@app.post("/salon_ibargo_after_call")
+salon_ibargo_router = APIRouter(
+    route_class=ORJSONRoute,
+    default_response_class=ORJSONResponse,
+)
+
+
+@salon_ibargo_router.post("/salon_ibargo_after_call")
 async def salon_ibargo_after_call_route(request: Request):
     return await handle_salon_after_call(request)
 
 
-# ----------------------------
-# ACTIONS
-# ----------------------------
-
-@app.post("/salon_ibargo_agendar_cita_disponibilidad")
-async def salon_ibargo_agendar_cita_route(request: Request):
-    return await agendar_cita_disponibilidad_endpoint(request)
+@salon_ibargo_router.post("/salon_ibargo_agendar_cita_disponibilidad")
+async def salon_ibargo_agendar_cita_route(payload: AgendarCitaDisponibilidadIn):
+    return await agendar_cita_disponibilidad_endpoint(payload)
 
 
-@app.post("/salon_ibargo_cotizar_evento")
-async def salon_ibargo_cotizar_evento_route(request: Request):
-    return await cotizar_evento_endpoint(request)
+@salon_ibargo_router.post("/salon_ibargo_cotizar_evento")
+async def salon_ibargo_cotizar_evento_route(payload: CotizarEventoIn):
+    return await cotizar_evento_endpoint(payload)
 
 
 # ============================================================
 # CAMPAIGN: SANATORIO QUIROZ
 # ============================================================
 
-# ----------------------------
-# AFTER CALL
-# ----------------------------
+sanatorio_quiroz_router = APIRouter(
+    route_class=ORJSONRoute,
+    default_response_class=ORJSONResponse,
+)
 
-@app.post("/sanatorio_quiroz_after_call")
+
+@sanatorio_quiroz_router.post("/sanatorio_quiroz_after_call")
 async def sanatorio_quiroz_after_call_route(request: Request):
     return await handle_sanatorio_quiroz_after_call(request)
 
@@ -195,29 +355,34 @@ async def sanatorio_quiroz_after_call_route(request: Request):
 # CAMPAIGN: VG CONSULTORIA
 # ============================================================
 
-# ----------------------------
-# AFTER CALL
-# ----------------------------
+vg_consultoria_router = APIRouter(
+    route_class=ORJSONRoute,
+    default_response_class=ORJSONResponse,
+)
+
 
-@app.post("/vg_consultoria_after_call")
+@vg_consultoria_router.post("/vg_consultoria_after_call")
 async def vg_consultoria_after_call_route(request: Request):
     return await handle_vg_consultoria_after_call(request)
 
 
-# ----------------------------
-# ACTIONS
-# ----------------------------
-
-@app.post("/vg_consultoria_agendar_cita_disponibilidad")
-async def vg_consultoria_agendar_cita_route(request: Request):
-    return await vg_agendar_cita_endpoint(request)
+@vg_consultoria_router.post("/vg_consultoria_agendar_cita_disponibilidad")
+async def vg_consultoria_agendar_cita_route(payload: VGAgendarCitaDisponibilidadIn):
+    return await vg_agendar_cita_endpoint(payload)
 
 
 # ============================================================
 # GOOGLE OAUTH (one-time per client setup)
 # ============================================================
 
-@app.get("/oauth/google/connect")
+oauth_router = APIRouter(
+    prefix="/oauth/google",
+    route_class=ORJSONRoute,
+    default_response_class=ORJSONResponse,
+)
+
+
+@oauth_router.get("/connect")
 async def oauth_google_connect(campaign: str):
     """
     Generates the Google OAuth consent URL for a campaign.
@@ -227,7 +392,7 @@ async def oauth_google_connect(campaign: str):
     return await start_oauth_flow(campaign)
 
 
-@app.get("/oauth/google/callback")
+@oauth_router.get("/callback")
 async def oauth_google_callback(request: Request):
     """
     Google redirects here after user grants consent.
@@ -236,6 +401,17 @@ async def oauth_google_callback(request: Request):
     return await handle_oauth_callback(request)
 
 
+# ============================================================
+# ROUTE TABLE
+# ============================================================
+
+app.include_router(salon_ibargo_call_router)
+app.include_router(salon_ibargo_router)
+app.include_router(sanatorio_quiroz_router)
+app.include_router(vg_consultoria_router)
+app.include_router(oauth_router)
+
+
 # ============================================================
 # GLOBAL ERROR HANDLER
 # ============================================================
@@ -243,10 +419,7 @@ async def oauth_google_callback(request: Request):
 @app.exception_handler(Exception)
 async def global_error_handler(request: Request, e: Exception):
     logger.exception("Unhandled exception during request")
-    return JSONResponse(
-        status_code=500,
-        content={"error": "internal_server_error"},
-    )
+    return _INTERNAL_ERR
 
 
 # ============================================================
@@ -258,12 +431,27 @@ if __name__ == "__main__":
 
     host = os.environ.get("HOST", "0.0.0.0")
     port = int(os.environ.get("PORT", 5000))
+    workers = int(os.environ.get("WEB_CONCURRENCY", os.cpu_count() or 1))
+    limit_concurrency = int(os.environ.get("MAX_CONN", 1000))
+
+    logger.info(
+        "Starting automation service on http://%s:%s (workers=%s)",
+        host,
+        port,
+        workers,
+    )
 
-    logger.info("Starting automation service on http://%s:%s", host, port)
-
+    # NOTE: workers share nothing — if sticky state (e.g. SSE) is ever
+    # added, route affinity has to be handled at the load balancer.
     uvicorn.run(
         "main:app",
         host=host,
         port=port,
+        loop="uvloop",
+        http="httptools",
+        workers=workers,
+        limit_concurrency=limit_concurrency,
+        backlog=2048,
+        timeout_keep_alive=5,
         reload=False,
     )
\ No newline at end of file
@@ -1,6 +1,7 @@
 import logging
-from fastapi import Request, HTTPException
-from fastapi.responses import JSONResponse
+from fastapi import HTTPException
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel, Field
 
 from .salon_ibargo_ai_utils import normalize_visit_datetime_pst
 
@@ -13,53 +14,53 @@ logger = logging.getLogger("salon_ibargo_actions")
 
 
 # =====================================================
-# BASE FIELD VALIDATION
+# REQUEST MODELS
 # =====================================================
+# Validation runs in pydantic-core (Rust) during FastAPI's body parse;
+# missing/empty fields come back as automatic 422s.
 
-def extract_base_fields(payload: dict):
-    conversation_id = payload.get("conversation_id")
-    channel = payload.get("channel")
+class AgendarCitaDisponibilidadIn(BaseModel):
+    conversation_id: str = Field(min_length=1)
+    channel: str = Field(min_length=1)
+    name: str = Field(min_length=1)
+    visit_date: str = Field(min_length=1)
+    visit_time: str = Field(min_length=1)
+    purpose: str = Field(min_length=1)
 
-    if not conversation_id:
-        raise HTTPException(
-            status_code=400,
-            detail="conversation_id is required",
-        )
-
-    if not channel:
-        raise HTTPException(
-            status_code=400,
-            detail="channel is required",
-        )
 
-    return conversation_id, channel
+class CotizarEventoIn(BaseModel):
+    conversation_id: str = Field(min_length=1)
+    channel: str = Field(min_length=1)
+    tipo_evento: str = Field(min_length=1)
+    numero_invitados: int
 
 
 # =====================================================
-# ACTION: agendar_cita_disponibilidad
+# PRICING
 # =====================================================
 
-async def agendar_cita_disponibilidad_endpoint(request: Request):
+EVENT_MULTIPLIER = {
+    "boda": 1.2,
+    "wedding": 1.2,
+    "conferencia": 1.1,
+    "corporativo": 1.1,
+}
 
-    payload = await request.json()
-    logger.info("[agendar_cita_disponibilidad] RAW PAYLOAD: %s", payload)
 
-    conversation_id, channel = extract_base_fields(payload)
+# =====================================================
+# ACTION: agendar_cita_disponibilidad
+# =====================================================
 
-    name = payload.get("name")
-    visit_date = payload.get("visit_date")
-    visit_time = payload.get("visit_time")
-    purpose = payload.get("purpose")
+async def agendar_cita_disponibilidad_endpoint(payload: AgendarCitaDisponibilidadIn):
 
-    if not all([name, visit_date, visit_time, purpose]):
-        raise HTTPException(
-            status_code=400,
-            detail="name, visit_date, visit_time, and purpose are required",
-        )
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("[agendar_cita_disponibilidad] RAW PAYLOAD: %s", payload)
+
+    name = payload.name
 
     normalized = await normalize_visit_datetime_pst(
-        visit_date=visit_date,
-        visit_time=visit_time,
+        visit_date=payload.visit_date,
+        visit_time=payload.visit_time,
     )
 
     if normalized.get("confidence") != "high":
@@ -71,19 +72,19 @@ async def agendar_cita_disponibilidad_endpoint(request: Request):
 
     visit = {
         "name": name,
-        "purpose": purpose,
+        "purpose": payload.purpose,
         "visit_date": normalized["visit_date"],
         "visit_time": normalized["visit_time"],
     }
 
     logger.info(
         "agendar_cita | conversation_id=%s channel=%s visit=%s",
-        conversation_id,
-        channel,
+        payload.conversation_id,
+        payload.channel,
         visit,
     )
 
-    return JSONResponse(
+    return ORJSONResponse(
         {
             "status": "confirmed",
             "confirmed_visit": visit,
@@ -99,44 +100,31 @@ async def agendar_cita_disponibilidad_endpoint(request: Request):
 # ACTION: cotizar_evento
 # =====================================================
 
-async def cotizar_evento_endpoint(request: Request):
+async def cotizar_evento_endpoint(payload: CotizarEventoIn):
 
-    payload = await request.json()
-    logger.info("[cotizar_evento] RAW PAYLOAD: %s", payload)
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("[cotizar_evento] RAW PAYLOAD: %s", payload)
 
-    conversation_id, channel = extract_base_fields(payload)
-
-    tipo_evento = payload.get("tipo_evento")
-    numero_invitados = payload.get("numero_invitados")
-
-    if not tipo_evento or numero_invitados is None:
-        raise HTTPException(
-            status_code=400,
-            detail="tipo_evento and numero_invitados are required",
-        )
+    tipo_evento = payload.tipo_evento
+    numero_invitados = payload.numero_invitados
 
     base_price = 5000
     price_per_guest = 350
 
-    cotizacion = base_price + (numero_invitados * price_per_guest)
-
-    tipo = tipo_evento.lower()
+    multiplier = EVENT_MULTIPLIER.get(tipo_evento.lower(), 1.0)
 
-    if tipo in {"boda", "wedding"}:
-        cotizacion *= 1.2
-    elif tipo in {"conferencia", "corporativo"}:
-        cotizacion *= 1.1
-
-    cotizacion = int(cotizacion)
+    cotizacion = int(
+        (base_price + numero_invitados * price_per_guest) * multiplier
+    )
 
     logger.info(
         "cotizar_evento | conversation_id=%s channel=%s price=%s",
-        conversation_id,
-        channel,
+        payload.conversation_id,
+        payload.channel,
         cotizacion,
     )
 
-    return JSONResponse(
+    return ORJSONResponse(
         {
             "status": "success",
             "estimated_price_mxn": cotizacion,
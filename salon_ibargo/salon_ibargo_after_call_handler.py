@@ -1,3 +1,4 @@
+import asyncio
 import logging
 import os
 from datetime import datetime
@@ -9,7 +10,7 @@ from salon_ibargo.salon_ibargo_ai_utils import (
     summarize_transcript,
     transcript_to_single_line,
 )
-from shared.gsheet_utils import append_row_to_sheet
+from shared.gsheet_batcher import enqueue_row
 
 
 # =====================================================
@@ -25,11 +26,15 @@ logger = logging.getLogger("salon_ibargo_after_conversation")
 
 PST = ZoneInfo("America/Los_Angeles")
 
+# Bound once at import: skips the datetime attribute lookup on the two
+# parses every request does.
+_fromisoformat = datetime.fromisoformat
+
 # =====================================================
 # SHEET HEADERS (MATCH GOOGLE SHEETS EXACTLY)
 # =====================================================
 
-CHAT_HEADERS = [
+CHAT_HEADERS = (
     "Creado",
     "Empiezo Chat",
     "Termino Chat",
@@ -37,9 +42,9 @@ CHAT_HEADERS = [
     "Transcripción",
     "Resumen",
     "ID",
-]
+)
 
-CALL_HEADERS = [
+CALL_HEADERS = (
     "Creado",
     "From Phone Number",
     "To Phone Number",
@@ -50,9 +55,9 @@ CALL_HEADERS = [
     "Resumen",
     "Grabación",
     "ID",
-]
+)
 
-VISIT_HEADERS = [
+VISIT_HEADERS = (
     "Creado",
     "Nombre",
     "From Phone Number",
@@ -61,7 +66,14 @@ VISIT_HEADERS = [
     "Fecha",
     "Hora",
     "ID Conversación",
-]
+)
+
+# Channel -> (sheet, headers, start column, end column). Unknown channels
+# fall back to the chat shape, same as the old per-channel branches did.
+CHANNEL_SCHEMA = {
+    "voice": ("Llamadas", CALL_HEADERS, "Empiezo Llamada", "Termino Llamada"),
+    "chat": ("Chats", CHAT_HEADERS, "Empiezo Chat", "Termino Chat"),
+}
 
 
 # =====================================================
@@ -72,7 +84,8 @@ async def handle_salon_after_call(request: Request):
 
     payload = await request.json()
 
-    logger.info("[handle_salon_after_call] RAW PAYLOAD: %s", payload)
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("[handle_salon_after_call] RAW PAYLOAD: %s", payload)
 
     # -------------------------------------------------
     # REQUIRED FIELDS
@@ -98,15 +111,10 @@ async def handle_salon_after_call(request: Request):
     # PARSE TIMESTAMPS
     # -------------------------------------------------
 
-    conversation_started_at = datetime.strptime(
-        started_str,
-        "%Y-%m-%d %H:%M:%S",
-    ).replace(tzinfo=PST)
-
-    conversation_ended_at = datetime.strptime(
-        ended_str,
-        "%Y-%m-%d %H:%M:%S",
-    ).replace(tzinfo=PST)
+    # fromisoformat handles "YYYY-MM-DD HH:MM:SS" directly and is a C
+    # fast path, unlike strptime which re-parses the format every call.
+    conversation_started_at = _fromisoformat(started_str).replace(tzinfo=PST)
+    conversation_ended_at = _fromisoformat(ended_str).replace(tzinfo=PST)
 
     duration = int(
         (conversation_ended_at - conversation_started_at).total_seconds()
@@ -116,81 +124,66 @@ async def handle_salon_after_call(request: Request):
     # SUMMARIZE TRANSCRIPT
     # -------------------------------------------------
 
-    summary = None
-    if transcript:
-        summary = await summarize_transcript(transcript, channel)
+    # Kick the LLM call off first; the transcript flattening and
+    # timestamp formatting below run while it is in flight.
+    summary_task = (
+        asyncio.create_task(summarize_transcript(transcript, channel))
+        if transcript
+        else None
+    )
+
+    single_line_transcript = transcript_to_single_line(transcript)
+
+    # Format each datetime exactly once; "Creado" mirrors the end time.
+    started_fmt = f"{conversation_started_at:%Y-%m-%d %H:%M:%S}"
+    ended_fmt = f"{conversation_ended_at:%Y-%m-%d %H:%M:%S}"
+    created_str = ended_fmt
+
+    if summary_task is not None:
+        summary = await summary_task
     else:
+        summary = None
         if channel == "voice":
             summary = "Llamada Fantasma 👻"
         if channel == "chat":
             summary = "Chat Fantasma 👻"
 
-    single_line_transcript = transcript_to_single_line(transcript)
-
-    created_str = conversation_ended_at.strftime("%Y-%m-%d %H:%M:%S")
-    started_fmt = conversation_started_at.strftime("%Y-%m-%d %H:%M:%S")
-    ended_fmt = conversation_ended_at.strftime("%Y-%m-%d %H:%M:%S")
-
     # =====================================================
     # ROUTE TO CORRECT CONVERSATION SHEET
     # =====================================================
 
-    if channel == "voice":
-
-        recording_url = f"https://bandia-toolkit-qwt3.onrender.com/recording?call_sid={call_sid}" if call_sid else None
-
-        sheet_name = "Llamadas"
-        headers = CALL_HEADERS
-
-        row = {
-            "Creado": created_str,
-            "From Phone Number": from_phone_number,
-            "To Phone Number": to_phone_number,
-            "Empiezo Llamada": started_fmt,
-            "Termino Llamada": ended_fmt,
-            "Duración": duration,
-            "Transcripción": single_line_transcript,
-            "Resumen": summary,
-            "Grabación": recording_url,
-            "ID": conversation_id,
-        }
-
-    elif channel == "chat":
-
-        sheet_name = "Chats"
-        headers = CHAT_HEADERS
-
-        row = {
-            "Creado": created_str,
-            "Empiezo Chat": started_fmt,
-            "Termino Chat": ended_fmt,
-            "Duración": duration,
-            "Transcripción": single_line_transcript,
-            "Resumen": summary,
-            "ID": conversation_id,
-        }
-
-    else:
-
+    if channel not in CHANNEL_SCHEMA:
         logger.warning(
             "Unknown channel '%s', defaulting to Chats sheet",
             channel,
         )
 
-        sheet_name = "Chats"
-        headers = CHAT_HEADERS
+    sheet_name, headers, start_key, end_key = CHANNEL_SCHEMA.get(
+        channel, CHANNEL_SCHEMA["chat"]
+    )
 
-        row = {
-            "Creado": created_str,
-            "Empiezo Chat": started_fmt,
-            "Termino Chat": ended_fmt,
-            "Duración": duration,
-            "Transcripción": single_line_transcript,
-            "Resumen": summary,
-            "ID": conversation_id,
-        }
+    # The writer serializes by header name, so voice-only keys are
+    # simply added on top of the shared shape.
+    row = {
+        "Creado": created_str,
+        start_key: started_fmt,
+        end_key: ended_fmt,
+        "Duración": duration,
+        "Transcripción": single_line_transcript,
+        "Resumen": summary,
+        "ID": conversation_id,
+    }
+
+    if channel == "voice":
+        row["From Phone Number"] = from_phone_number
+        row["To Phone Number"] = to_phone_number
+        row["Grabación"] = (
+            f"https://bandia-toolkit-qwt3.onrender.com/recording?call_sid={call_sid}"
+            if call_sid
+            else None
+        )
 
-    append_row_to_sheet(
+    await enqueue_row(
         campaign="salon_ibargo",
         sheet_name=sheet_name,
         headers=headers,
@@ -214,7 +207,7 @@ async def handle_salon_after_call(request: Request):
             "ID Conversación": conversation_id,
         }
 
-        append_row_to_sheet(
+        await enqueue_row(
             campaign="salon_ibargo",
             sheet_name="Citas",
             headers=VISIT_HEADERS,
@@ -0,0 +1,853 @@
+"""
+shared/ai_utils.py
+--------------------------------
+LLM helpers shared by every campaign: transcript flattening and
+condensation, summarization, and fuzzy date/time normalization.
+
+The three campaign ai_utils modules had drifted into near-identical
+copies, each with its own OpenAI client, caches and logger. One
+implementation here means one client/HTTPX pool, one set of caches
+(better hit rates) and one place to tune prompts; the campaign modules
+are thin re-export shims kept for their existing import paths.
+"""
+
+from typing import List, Literal
+import os
+import logging
+from functools import lru_cache
+
+import httpx
+from diskcache import Cache
+from dotenv import load_dotenv
+from pydantic import BaseModel
+from openai import AsyncOpenAI
+
+from shared.openai_utils import (
+    LRUCache,
+    OAI_RATE_LIMITER,
+    OAI_SEMAPHORE,
+    cache_key,
+    estimate_tokens,
+)
+
+import asyncio
+import io
+import orjson
+import re
+from datetime import datetime
+from zoneinfo import ZoneInfo
+
+PST = ZoneInfo("America/Los_Angeles")
+
+
+# -------------------------------------------------
+# Environment
+# -------------------------------------------------
+
+BASE_DIR = os.path.dirname(__file__)
+
+# -------------------------------------------------
+# OpenAI client (lazy)
+# -------------------------------------------------
+
+@lru_cache(maxsize=1)
+def get_client() -> AsyncOpenAI:
+    """
+    Builds the shared client on first use. Importing the module (e.g.
+    for transcript_to_single_line alone) no longer pays the .env disk
+    read and no longer requires OPENAI_API_KEY to be set.
+    """
+    load_dotenv()
+
+    api_key = os.environ.get("OPENAI_API_KEY")
+    if not api_key:
+        raise RuntimeError("OPENAI_API_KEY not found in .env")
+
+    # One pooled HTTP/2 client for the SDK: multiplexed streams over a
+    # few kept-alive connections instead of a TCP+TLS handshake per
+    # burst, with a tight connect timeout so a stuck handshake fails
+    # fast while slow generations still get their 60 s.
+    return AsyncOpenAI(
+        api_key=api_key,
+        max_retries=0,
+        http_client=httpx.AsyncClient(
+            http2=True,
+            limits=httpx.Limits(max_connections=200, max_keepalive_connections=100),
+            timeout=httpx.Timeout(60.0, connect=5.0),
+        ),
+    )
+
+SUM_MODEL = "gpt-5.4"
+STD_MODEL = "gpt-5.4-mini"
+
+# Exact-match caches keyed on content hashes; see shared.openai_utils.
+_summary_cache = LRUCache(maxsize=4096)
+_normalize_cache = LRUCache(maxsize=4096)
+
+
+@lru_cache(maxsize=1)
+def _get_disk_cache() -> Cache:
+    """Disk tier for normalizer results; survives restarts/redeploys."""
+    return Cache(os.path.join(BASE_DIR, ".ai_cache"), size_limit=int(1e9))
+
+# -------------------------------------------------
+# Logging (minimal)
+# -------------------------------------------------
+# Level/handlers come from the entrypoint (LOG_LEVEL env in main.py).
+
+logger = logging.getLogger("ai_utils")
+
+# -------------------------------------------------
+# Models
+# -------------------------------------------------
+
+class TranscriptItem(BaseModel):
+    role: str
+    content: str
+
+
+class NormalizedVisit(BaseModel):
+    """Schema the normalizer model is constrained to via structured
+    outputs — generation cannot produce unparseable JSON."""
+    date: str
+    time: str
+    confidence: Literal["high", "low"]
+
+
+class CallResult(BaseModel):
+    """Combined schema for the fused summary + appointment call."""
+    summary: str
+    visit: NormalizedVisit | None
+
+
+# -------------------------------------------------
+# Helpers
+# -------------------------------------------------
+
+# Exactly the shapes the normalizer prompt demands; compiled once so
+# validation is a match call instead of two strptime round-trips.
+_DATE_RE = re.compile(r"^\d{4}-\d{2}-\d{2}$")
+_TIME_RE = re.compile(r"^\d{2}:\d{2}$")
+
+# "7pm" / "7 pm" / "7:30 p.m." style times resolve without the model.
+_AMPM_RE = re.compile(r"^(\d{1,2})(?::(\d{2}))?\s*(am|pm|a\.m\.|p\.m\.)$", re.IGNORECASE)
+
+
+def _resolve_time_fast(visit_time: str) -> str | None:
+    """
+    Resolves unambiguous time spellings ("19:00", "7pm", "7:30 pm")
+    deterministically; returns None when the model has to decide.
+    """
+
+    if _TIME_RE.match(visit_time):
+        return visit_time
+
+    m = _AMPM_RE.match(visit_time)
+    if not m:
+        return None
+
+    hour = int(m.group(1))
+    minute = int(m.group(2) or 0)
+    meridiem = m.group(3)[0].lower()
+
+    if not (1 <= hour <= 12) or minute > 59:
+        return None
+
+    if meridiem == "p" and hour != 12:
+        hour += 12
+    elif meridiem == "a" and hour == 12:
+        hour = 0
+
+    return f"{hour:02d}:{minute:02d}"
+
+
+# Collapses embedded line breaks/tabs in one C-level pass per message.
+_WS_TABLE = str.maketrans({"\n": " ", "\r": " ", "\t": " "})
+
+
+def transcript_to_single_line(transcript: list[dict]) -> str:
+    parts: list[str] = []
+    append = parts.append
+
+    for item in transcript:
+        content = item.get("content")
+        if not content:
+            continue
+        append(f"{item['role'].upper()}: {content.translate(_WS_TABLE).strip()}")
+
+    return " | ".join(parts)
+
+
+def condense_transcript(
+    transcript: list[dict],
+    keep_first: int = 2,
+    keep_last: int = 8,
+    char_budget: int = 6000,
+) -> str:
+    """
+    Flattens a transcript for the summary prompt with a bounded size.
+
+    Short transcripts pass through unchanged. Long ones keep the first
+    keep_first and last keep_last messages — where intent and outcome
+    live — and replace the middle with an "<omitidos N mensajes>"
+    marker, so tokens sent per summary stay bounded no matter how long
+    the conversation ran.
+    """
+
+    full = transcript_to_single_line(transcript)
+    if len(full) <= char_budget:
+        return full
+
+    if len(transcript) <= keep_first + keep_last:
+        return full[:char_budget]
+
+    omitted = len(transcript) - keep_first - keep_last
+    head = transcript_to_single_line(transcript[:keep_first])
+    tail = transcript_to_single_line(transcript[-keep_last:])
+
+    return f"{head} | <omitidos {omitted} mensajes> | {tail}"
+
+
+
+# Invariant summary instructions, rendered once. A byte-stable
+# prompt prefix also feeds OpenAI's server-side prompt cache.
+def _build_summary_preamble(medium: str, ghost_label: str) -> str:
+    return (
+        f"Resume la siguiente {medium} en UN SOLO PÁRRAFO breve. "
+        "No uses listas ni encabezados. "
+        "Describe la intención del cliente y cómo terminó la conversación.\n\n"
+        f"Si el cliente nunca dijo nada coherente o la {medium} fue silenciosa, "
+        f"responde ÚNICAMENTE con: '{ghost_label}'. No agregar nada extra.\n\n"
+    )
+
+
+_SUMMARY_PREAMBLES = {
+    "voice": _build_summary_preamble("llamada telefónica", "Llamada Fantasma 👻"),
+    "chat": _build_summary_preamble("conversación de chat", "Chat Fantasma 👻"),
+    "other": _build_summary_preamble("conversación", "Fantasma 👻"),
+}
+
+
+# -------------------------------------------------
+# Public API
+# -------------------------------------------------
+
+async def summarize_transcript(transcript: List[TranscriptItem], channel: str = "voice") -> str:
+
+    if channel == "voice":
+        ghost_label = "Llamada Fantasma 👻"
+    elif channel == "chat":
+        ghost_label = "Chat Fantasma 👻"
+    else:
+        ghost_label = "Fantasma 👻"
+
+    transcript_dicts = [
+        item if isinstance(item, dict) else vars(item)
+        for item in transcript
+    ]
+
+    user_turns = [item for item in transcript_dicts if item.get("role") == "user"]
+    user_content = " ".join(
+        item.get("content", "") or "" for item in user_turns
+    ).strip()
+
+    if not user_content or len(user_content) < 10:
+        logger.info("summarize_transcript: ghost detected (no user input) channel=%s", channel)
+        return ghost_label
+
+    transcript_text = condense_transcript(transcript)
+
+    _ckey = cache_key(channel, transcript_text)
+    cached = _summary_cache.get(_ckey)
+    if cached is not None:
+        return cached
+
+    prompt = (
+        _SUMMARY_PREAMBLES.get(channel, _SUMMARY_PREAMBLES["other"])
+        + transcript_text
+    )
+
+    logger.info("summarize_transcript: calling %s channel=%s", SUM_MODEL, channel)
+
+    try:
+        async with OAI_SEMAPHORE:
+            await OAI_RATE_LIMITER.acquire(estimate_tokens(prompt, completion_budget=200))
+            parts: list[str] = []
+            async with get_client().responses.stream(
+                model=SUM_MODEL,
+                input=[{"role": "user", "content": prompt}],
+                max_output_tokens=200,
+                timeout=30.0,
+            ) as stream:
+                async for event in stream:
+                    if event.type != "response.output_text.delta":
+                        continue
+                    parts.append(event.delta)
+                    # The prompt asks for one short paragraph — stop at
+                    # the first paragraph break instead of waiting out
+                    # whatever else the model generates.
+                    if "\n\n" in "".join(parts[-2:]):
+                        await stream.close()
+                        break
+
+        result = "".join(parts).split("\n\n", 1)[0].strip()
+
+    except TimeoutError:
+        logger.warning("summarize_transcript: request timed out channel=%s", channel)
+        return "Resumen no disponible (tiempo de espera agotado)."
+
+    except Exception:
+        logger.exception("summarize_transcript: unexpected error channel=%s", channel)
+        return "Resumen no disponible (error interno)."
+
+    if not result:
+        logger.warning("summarize_transcript: model returned empty response channel=%s", channel)
+        return "Resumen no disponible (respuesta vacía del modelo)."
+
+    _summary_cache.put(_ckey, result)
+
+    return result
+
+
+async def summarize_transcripts_batch(
+    transcripts: List[list],
+    channel: str = "voice",
+    poll_interval: float = 30.0,
+) -> List[str]:
+    """
+    Summarizes many transcripts through OpenAI's Batch API instead of
+    live requests. Meant for non-interactive reprocessing: batch jobs
+    run on separate quota at roughly half the live price, at the cost
+    of completion latency (up to the 24 h window). Blocks until the
+    batch finishes and returns summaries in input order; ghosts are
+    labeled locally without being submitted, and failed items carry the
+    standard unavailable message.
+    """
+
+    if not transcripts:
+        return []
+
+    if channel == "voice":
+        ghost_label = "Llamada Fantasma 👻"
+    elif channel == "chat":
+        ghost_label = "Chat Fantasma 👻"
+    else:
+        ghost_label = "Fantasma 👻"
+
+    preamble = _SUMMARY_PREAMBLES.get(channel, _SUMMARY_PREAMBLES["other"])
+    results = ["Resumen no disponible (error interno)."] * len(transcripts)
+
+    lines = []
+    for i, transcript in enumerate(transcripts):
+        transcript_dicts = [
+            item if isinstance(item, dict) else vars(item)
+            for item in transcript
+        ]
+        user_content = " ".join(
+            item.get("content", "") or ""
+            for item in transcript_dicts
+            if item.get("role") == "user"
+        ).strip()
+
+        if not user_content or len(user_content) < 10:
+            results[i] = ghost_label
+            continue
+
+        lines.append(orjson.dumps({
+            "custom_id": str(i),
+            "method": "POST",
+            "url": "/v1/responses",
+            "body": {
+                "model": SUM_MODEL,
+                "input": [
+                    {
+                        "role": "user",
+                        "content": preamble + condense_transcript(transcript),
+                    }
+                ],
+                "max_output_tokens": 200,
+            },
+        }))
+
+    if not lines:
+        return results
+
+    client = get_client()
+
+    # The Files API requires a .jsonl filename for purpose="batch"; a
+    # bare BytesIO would upload as "upload" and be rejected with a 400.
+    batch_file = await client.files.create(
+        file=("batch.jsonl", io.BytesIO(b"\n".join(lines) + b"\n")),
+        purpose="batch",
+    )
+
+    batch = await client.batches.create(
+        input_file_id=batch_file.id,
+        endpoint="/v1/responses",
+        completion_window="24h",
+    )
+
+    logger.info(
+        "summarize_transcripts_batch: submitted batch=%s requests=%d",
+        batch.id,
+        len(lines),
+    )
+
+    # Poll on a growing interval — offline work needs no tight loop.
+    delay = poll_interval
+    while batch.status in ("validating", "in_progress", "finalizing"):
+        await asyncio.sleep(delay)
+        delay = min(delay * 1.5, 300.0)
+        batch = await client.batches.retrieve(batch.id)
+
+    if batch.status != "completed" or not batch.output_file_id:
+        logger.warning(
+            "summarize_transcripts_batch: batch=%s ended status=%s",
+            batch.id,
+            batch.status,
+        )
+        return results
+
+    output = await client.files.content(batch.output_file_id)
+
+    for line in output.text.splitlines():
+        if not line.strip():
+            continue
+        try:
+            item = orjson.loads(line)
+            idx = int(item["custom_id"])
+            body = item["response"]["body"]
+            text = "".join(
+                chunk.get("text", "")
+                for out in body.get("output", [])
+                for chunk in out.get("content", []) or []
+                if chunk.get("type") == "output_text"
+            ).strip()
+            if text:
+                results[idx] = text.split("\n\n", 1)[0].strip()
+        except Exception:
+            logger.exception("summarize_transcripts_batch: bad output line")
+
+    return results
+
+
+# Invariant prompt blocks, built once. A byte-stable prefix is also what
+# lets OpenAI's server-side prompt cache discount repeated input tokens.
+_NORMALIZER_PREAMBLE = (
+    "Resuelve fecha y hora a valores explícitos.\n"
+    "\n"
+    "REGLAS OBLIGATORIAS:\n"
+    "- No inventes valores.\n"
+    "- Ignora zona horaria.\n"
+    "- Si la fecha de entrada no tiene año, asume siempre el año en curso indicado en la referencia.\n"
+    '- Si la fecha y hora pueden resolverse sin ambigüedad, confidence = "high".\n'
+    '- Si no hay una fecha y hora de entrada valido, confidence = "low".\n'
+)
+
+_NORMALIZER_BATCH_PREAMBLE = (
+    "Resuelve fecha y hora a valores explícitos para CADA entrada.\n"
+    "\n"
+    "REGLAS OBLIGATORIAS:\n"
+    "- Devuelve SOLO JSON válido.\n"
+    "- No agregues texto adicional.\n"
+    "- No expliques nada.\n"
+    "- No inventes valores.\n"
+    "- Ignora zona horaria.\n"
+    "- Si la fecha de entrada no tiene año, asume siempre el año en curso indicado en la referencia.\n"
+    '- Si la fecha y hora pueden resolverse sin ambigüedad, confidence = "high".\n'
+    '- Si no hay una fecha y hora de entrada valido, confidence = "low".\n'
+    "- Devuelve un resultado por entrada, en el mismo orden.\n"
+)
+
+_NORMALIZER_BATCH_FORMAT = (
+    "\nFormato EXACTO requerido:\n"
+    "{\n"
+    '"results": [\n'
+    '{"date": "YYYY-MM-DD", "time": "HH:MM", "confidence": "high|low"}\n'
+    "]\n"
+    "}\n"
+)
+
+
+_NORM_FALLBACK = {
+    "visit_date": None,
+    "visit_time": None,
+    "visit_datetime_iso": None,
+    "timezone": "America/Los_Angeles",
+    "confidence": "low",
+}
+
+
+def _extract_json(raw_text: str):
+    """Strips an optional ```json fence and parses; None on failure."""
+
+    if raw_text.startswith("```"):
+        raw_text = raw_text.split("```")[1]
+        if raw_text.lower().startswith("json"):
+            raw_text = raw_text[4:]
+        raw_text = raw_text.strip()
+
+    try:
+        return orjson.loads(raw_text)
+    except orjson.JSONDecodeError:
+        logger.warning("normalize_visit_datetime_pst: JSON parse failed — raw=%s", raw_text)
+        return None
+
+
+def _normalized_item_to_result(data: dict) -> dict:
+    """
+    Validates one model-emitted {date, time, confidence} item and turns
+    it into the public result dict. Anything malformed degrades to a
+    low-confidence result carrying whatever the model returned.
+    """
+
+    date_str = data.get("date")
+    time_str = data.get("time")
+    confidence = data.get("confidence", "low")
+
+    if not isinstance(date_str, str) or not isinstance(time_str, str):
+        logger.warning("normalize_visit_datetime_pst: invalid types date=%r time=%r", date_str, time_str)
+        return {**_NORM_FALLBACK, "visit_date": date_str, "visit_time": time_str}
+
+    if not _DATE_RE.match(date_str) or not _TIME_RE.match(time_str):
+        logger.warning("normalize_visit_datetime_pst: invalid format date=%r time=%r", date_str, time_str)
+        return {**_NORM_FALLBACK, "visit_date": date_str, "visit_time": time_str}
+
+    if confidence != "high":
+        logger.info("normalize_visit_datetime_pst: low confidence date=%r time=%r", date_str, time_str)
+        return {**_NORM_FALLBACK, "visit_date": date_str, "visit_time": time_str}
+
+    try:
+        # fromisoformat is a C fast path and still rejects out-of-range
+        # values (month 13, hour 25) the regexes let through.
+        dt = datetime.fromisoformat(f"{date_str}T{time_str}").replace(tzinfo=PST)
+    except ValueError:
+        logger.exception("normalize_visit_datetime_pst: datetime construction failed")
+        return {**_NORM_FALLBACK, "visit_date": date_str, "visit_time": time_str}
+
+    return {
+        "visit_date": date_str,
+        "visit_time": time_str,
+        "visit_datetime_iso": dt.isoformat(),
+        "timezone": "America/Los_Angeles",
+        "confidence": "high",
+    }
+
+
+async def normalize_visit_datetime_pst(
+    visit_date: str,
+    visit_time: str,
+) -> dict:
+
+    visit_date = (visit_date or "").strip()
+    visit_time = (visit_time or "").strip()
+
+    if not visit_date and not visit_time:
+        logger.warning("normalize_visit_datetime_pst: both inputs are empty")
+        return dict(_NORM_FALLBACK)
+
+    reference_dt = datetime.now(PST)
+    # 10-minute bucket: still plenty of resolution for "mañana 7pm",
+    # and identical prompt prefixes across nearby calls let both the
+    # local caches and OpenAI's server-side prompt cache actually hit.
+    reference_dt = reference_dt.replace(
+        minute=(reference_dt.minute // 10) * 10, second=0, microsecond=0
+    )
+    reference_date_str = reference_dt.strftime("%Y-%m-%d")
+    reference_time_str = reference_dt.strftime("%H:%M")
+
+    _ckey = cache_key(visit_date, visit_time, reference_date_str, reference_time_str)
+    cached = _normalize_cache.get(_ckey)
+    if cached is not None:
+        return cached
+
+    # Deterministic fast path: an already-ISO date plus an unambiguous
+    # time spelling needs no model call at all.
+    if _DATE_RE.match(visit_date):
+        fast_time = _resolve_time_fast(visit_time)
+        if fast_time is not None:
+            result = _normalized_item_to_result(
+                {"date": visit_date, "time": fast_time, "confidence": "high"}
+            )
+            if result["confidence"] == "high":
+                _normalize_cache.put(_ckey, result)
+            return result
+
+    # Disk tier: normalization is deterministic given the inputs and
+    # the (already bucketed) reference, so warm results carry across
+    # process restarts under the same key as the memory tier. SQLite
+    # I/O goes through a worker thread, same as the Sheets writes.
+    cached = await asyncio.to_thread(_get_disk_cache().get, _ckey)
+    if cached is not None:
+        _normalize_cache.put(_ckey, cached)
+        return cached
+
+    prompt = _NORMALIZER_PREAMBLE + (
+        f"\nReferencia actual:\n"
+        f"Fecha: {reference_date_str}\n"
+        f"Hora: {reference_time_str}\n"
+        f"\nEntrada:\n"
+        f'fecha: "{visit_date}"\n'
+        f'hora: "{visit_time}"\n'
+    )
+
+    try:
+        async with OAI_SEMAPHORE:
+            await OAI_RATE_LIMITER.acquire(estimate_tokens(prompt, completion_budget=60))
+            response = await get_client().responses.parse(
+                model=STD_MODEL,
+                input=[{"role": "user", "content": prompt}],
+                text_format=NormalizedVisit,
+                timeout=25.0,
+            )
+
+    except TimeoutError:
+        logger.warning("normalize_visit_datetime_pst: model request timed out")
+        return dict(_NORM_FALLBACK)
+    except Exception:
+        logger.exception("normalize_visit_datetime_pst: model request failed")
+        return dict(_NORM_FALLBACK)
+
+    parsed = response.output_parsed
+
+    if parsed is None:
+        logger.warning("normalize_visit_datetime_pst: model returned no parsed output")
+        return dict(_NORM_FALLBACK)
+
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("normalize_visit_datetime_pst: parsed=%s", parsed)
+
+    result = _normalized_item_to_result(parsed.model_dump())
+
+    logger.info(
+        "normalizer done confidence=%s date=%s time=%s",
+        result["confidence"],
+        result["visit_date"],
+        result["visit_time"],
+    )
+
+    if result["confidence"] == "high":
+        _normalize_cache.put(_ckey, result)
+        await asyncio.to_thread(
+            _get_disk_cache().set, _ckey, result, expire=86400
+        )
+
+    return result
+
+
+async def normalize_visit_datetime_pst_batch(
+    pairs: List[tuple[str, str]],
+) -> List[dict]:
+    """
+    Normalizes many (visit_date, visit_time) pairs with a single model
+    call. One request replaces N round-trips, which matters when a
+    backlog of pending normalizations is RPM-bound rather than
+    TPM-bound. Results come back in input order.
+    """
+
+    if not pairs:
+        return []
+
+    if len(pairs) == 1:
+        visit_date, visit_time = pairs[0]
+        return [await normalize_visit_datetime_pst(visit_date, visit_time)]
+
+    reference_dt = datetime.now(PST)
+    # 10-minute bucket: still plenty of resolution for "mañana 7pm",
+    # and identical prompt prefixes across nearby calls let both the
+    # local caches and OpenAI's server-side prompt cache actually hit.
+    reference_dt = reference_dt.replace(
+        minute=(reference_dt.minute // 10) * 10, second=0, microsecond=0
+    )
+    reference_date_str = reference_dt.strftime("%Y-%m-%d")
+    reference_time_str = reference_dt.strftime("%H:%M")
+
+    entries = "\n\n".join(
+        f'Entrada {i}:\nfecha: "{(d or "").strip()}"\nhora: "{(t or "").strip()}"'
+        for i, (d, t) in enumerate(pairs, 1)
+    )
+
+    prompt = (
+        _NORMALIZER_BATCH_PREAMBLE
+        + (
+            f"\nReferencia actual:\n"
+            f"Fecha: {reference_date_str}\n"
+            f"Hora: {reference_time_str}\n"
+            f"\n{entries}\n"
+        )
+        + _NORMALIZER_BATCH_FORMAT
+    )
+
+    fallback = [dict(_NORM_FALLBACK) for _ in pairs]
+
+    try:
+        async with OAI_SEMAPHORE:
+            await OAI_RATE_LIMITER.acquire(
+                estimate_tokens(prompt, completion_budget=40 * len(pairs))
+            )
+            response = await get_client().responses.create(
+                model=STD_MODEL,
+                input=[{"role": "user", "content": prompt}],
+                timeout=25.0,
+            )
+
+    except TimeoutError:
+        logger.warning("normalize_visit_datetime_pst_batch: model request timed out")
+        return fallback
+    except Exception:
+        logger.exception("normalize_visit_datetime_pst_batch: model request failed")
+        return fallback
+
+    raw_text = response.output_text.strip()
+
+    if not raw_text:
+        logger.warning("normalize_visit_datetime_pst_batch: model returned empty response")
+        return fallback
+
+    data = _extract_json(raw_text)
+    results = data.get("results") if isinstance(data, dict) else None
+
+    if not isinstance(results, list) or len(results) != len(pairs):
+        logger.warning(
+            "normalize_visit_datetime_pst_batch: expected %d results, got %r",
+            len(pairs),
+            results,
+        )
+        return fallback
+
+    return [
+        _normalized_item_to_result(item) if isinstance(item, dict) else dict(_NORM_FALLBACK)
+        for item in results
+    ]
+
+
+# Invariant instructions for the fused summary + appointment call.
+_COMBINED_PREAMBLE = (
+    "Analiza la siguiente conversación y devuelve dos campos.\n"
+    "\n"
+    "summary: resume la conversación en UN SOLO PÁRRAFO breve, sin listas "
+    "ni encabezados, describiendo la intención del cliente y cómo terminó "
+    "la conversación.\n"
+    'visit: si el cliente acordó una visita con fecha y hora resolubles '
+    'sin ambigüedad, devuélvela normalizada (date "YYYY-MM-DD", time '
+    '"HH:MM", confidence "high"); usa confidence "low" si son ambiguas; '
+    "devuelve null si no se acordó ninguna visita.\n"
+    "\n"
+    "REGLAS:\n"
+    "- No inventes valores.\n"
+    "- Ignora zona horaria.\n"
+    "- Si la fecha de entrada no tiene año, asume siempre el año en curso indicado en la referencia.\n"
+)
+
+_combined_cache = LRUCache(maxsize=1024)
+
+
+async def summarize_and_normalize(
+    transcript: List[TranscriptItem],
+    hint_date: str | None = None,
+    hint_time: str | None = None,
+) -> dict:
+    """
+    Produces the summary and the normalized appointment from one model
+    call instead of two serialized round-trips — the transcript is sent
+    (and billed) once. Returns {"summary": str, "visit": dict | None},
+    where visit matches the normalize_visit_datetime_pst result shape.
+
+    hint_date/hint_time, when the agent already captured them during
+    the conversation, are passed along so the model resolves those
+    instead of re-mining the transcript.
+    """
+
+    transcript_text = condense_transcript(transcript)
+
+    reference_dt = datetime.now(PST)
+    reference_dt = reference_dt.replace(
+        minute=(reference_dt.minute // 10) * 10, second=0, microsecond=0
+    )
+    reference_date_str = reference_dt.strftime("%Y-%m-%d")
+    reference_time_str = reference_dt.strftime("%H:%M")
+
+    _ckey = cache_key(
+        transcript_text,
+        hint_date or "",
+        hint_time or "",
+        reference_date_str,
+        reference_time_str,
+    )
+    cached = _combined_cache.get(_ckey)
+    if cached is not None:
+        return cached
+
+    hints = ""
+    if hint_date or hint_time:
+        hints = (
+            f"\nDatos ya capturados por el agente:\n"
+            f'fecha: "{hint_date or ""}"\n'
+            f'hora: "{hint_time or ""}"\n'
+        )
+
+    prompt = _COMBINED_PREAMBLE + (
+        f"\nReferencia actual:\n"
+        f"Fecha: {reference_date_str}\n"
+        f"Hora: {reference_time_str}\n"
+        f"{hints}\n"
+        f"{transcript_text}"
+    )
+
+    fallback = {"summary": "Resumen no disponible (error interno).", "visit": None}
+
+    try:
+        async with OAI_SEMAPHORE:
+            await OAI_RATE_LIMITER.acquire(estimate_tokens(prompt, completion_budget=260))
+            response = await get_client().responses.parse(
+                model=SUM_MODEL,
+                input=[{"role": "user", "content": prompt}],
+                text_format=CallResult,
+                timeout=30.0,
+            )
+
+    except TimeoutError:
+        logger.warning("summarize_and_normalize: request timed out")
+        return {
+            "summary": "Resumen no disponible (tiempo de espera agotado).",
+            "visit": None,
+        }
+    except Exception:
+        logger.exception("summarize_and_normalize: unexpected error")
+        return fallback
+
+    parsed = response.output_parsed
+
+    if parsed is None:
+        logger.warning("summarize_and_normalize: model returned no parsed output")
+        return fallback
+
+    visit = (
+        _normalized_item_to_result(parsed.visit.model_dump())
+        if parsed.visit is not None
+        else None
+    )
+
+    result = {
+        "summary": parsed.summary.strip() or fallback["summary"],
+        "visit": visit,
+    }
+
+    _combined_cache.put(_ckey, result)
+
+    return result
+
+
+if __name__ == "__main__":
+    import asyncio
+
+    logging.basicConfig(level=logging.INFO)
+
+    async def test():
+        result = await normalize_visit_datetime_pst(
+            visit_date="jueves 12 de marzo",
+            visit_time="1:00 pm",
+        )
+        print(result)
+
+    asyncio.run(test())
\ No newline at end of file
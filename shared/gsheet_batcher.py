@@ -0,0 +1,155 @@
+"""
+shared/gsheet_batcher.py
+--------------------------------
+Coalesces Google Sheets row appends across requests.
+
+Handlers enqueue rows and return immediately; a single consumer task
+drains the queue (up to MAX_BATCH_ROWS rows or FLUSH_INTERVAL_SECONDS,
+whichever comes first), groups rows by (campaign, sheet) and writes each
+group with one Sheets API call. This turns N per-request round-trips
+into ~1 amortized RPC and keeps quota use flat under load.
+
+Rows for the same sheet are flushed in enqueue order.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import Dict, List, Sequence
+
+from shared.gsheet_utils import append_rows_to_sheet
+
+
+logger = logging.getLogger("gsheet_batcher")
+
+
+# =====================================================
+# CONFIG
+# =====================================================
+
+MAX_BATCH_ROWS = 50
+FLUSH_INTERVAL_SECONDS = 0.5
+
+
+# =====================================================
+# STATE (single queue, single consumer)
+# =====================================================
+
+_queue: asyncio.Queue | None = None
+_consumer_task: asyncio.Task | None = None
+
+
+def _ensure_started() -> asyncio.Queue:
+    global _queue, _consumer_task
+
+    if _queue is None:
+        _queue = asyncio.Queue()
+
+    if _consumer_task is None or _consumer_task.done():
+        _consumer_task = asyncio.get_running_loop().create_task(_consume())
+
+    return _queue
+
+
+# =====================================================
+# PUBLIC API
+# =====================================================
+
+async def enqueue_row(
+    *,
+    campaign: str,
+    sheet_name: str,
+    headers: Sequence[str],
+    row: Dict,
+):
+    """
+    Queues one row for the next batched append.
+
+    Write errors happen on the consumer task and are logged there —
+    callers must not depend on the row being persisted when this returns.
+    """
+    queue = _ensure_started()
+    await queue.put((campaign, sheet_name, headers, row))
+
+
+async def flush_pending():
+    """
+    Stops the consumer — which writes out any rows it had already
+    dequeued into its current batch — then drains and writes whatever
+    is still queued. Called from app shutdown so rows enqueued by
+    in-flight requests aren't dropped on redeploy.
+    """
+    global _consumer_task
+
+    if _consumer_task is not None and not _consumer_task.done():
+        _consumer_task.cancel()
+        try:
+            await _consumer_task
+        except asyncio.CancelledError:
+            pass
+    _consumer_task = None
+
+    if _queue is None:
+        return
+
+    batch = []
+    while not _queue.empty():
+        batch.append(_queue.get_nowait())
+
+    await _flush(batch)
+
+
+# =====================================================
+# CONSUMER
+# =====================================================
+
+async def _consume():
+    while True:
+        batch = [await _queue.get()]
+
+        try:
+            while len(batch) < MAX_BATCH_ROWS:
+                item = await asyncio.wait_for(
+                    _queue.get(),
+                    timeout=FLUSH_INTERVAL_SECONDS,
+                )
+                batch.append(item)
+        except asyncio.TimeoutError:
+            pass
+        except asyncio.CancelledError:
+            # Shutdown: rows already pulled off the queue live only in
+            # this local batch — write them before going away.
+            await _flush(batch)
+            raise
+
+        await _flush(batch)
+
+
+async def _flush(batch):
+    if not batch:
+        return
+
+    grouped: Dict[tuple, tuple] = {}
+    for campaign, sheet_name, headers, row in batch:
+        key = (campaign, sheet_name)
+        if key not in grouped:
+            grouped[key] = (headers, [])
+        grouped[key][1].append(row)
+
+    for (campaign, sheet_name), (headers, rows) in grouped.items():
+        try:
+            await asyncio.to_thread(
+                append_rows_to_sheet,
+                campaign=campaign,
+                sheet_name=sheet_name,
+                headers=headers,
+                rows=rows,
+            )
+        except Exception:
+            logger.exception(
+                "Batched append failed campaign=%s sheet=%s rows=%d",
+                campaign,
+                sheet_name,
+                len(rows),
+            )
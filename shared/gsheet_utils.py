@@ -1,4 +1,4 @@
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Sequence
 from pathlib import Path
 import logging
 import os
@@ -74,6 +74,23 @@ def _get_sheets_service(campaign: str):
         _services[campaign] = build("sheets", "v4", credentials=creds)
     return _services[campaign]
 
+
+def warm_sheets_services():
+    """
+    Builds the Sheets client for every configured campaign up front so
+    the first real request doesn't pay credential loading + discovery.
+    Campaigns without credentials in env are skipped with a warning.
+    """
+    for campaign in SPREADSHEET_IDS:
+        try:
+            _get_sheets_service(campaign)
+            logger.info("Sheets client warmed campaign=%s", campaign)
+        except Exception:
+            logger.warning(
+                "Could not warm Sheets client campaign=%s (missing credentials?)",
+                campaign,
+            )
+
 # =====================================================
 # HELPERS
 # =====================================================
@@ -93,54 +110,50 @@ def get_spreadsheet_id_for_campaign(campaign: str) -> str:
 # PUBLIC API
 # =====================================================
 
-def append_row_to_sheet(
+def append_rows_to_sheet(
     *,
     campaign: str,
     sheet_name: str,
-    headers: List[str],
-    row: Dict,
+    headers: Sequence[str],
+    rows: List[Dict],
 ):
     """
-    Appends one row into the target sheet for the given campaign.
+    Appends a batch of rows into the target sheet in one API call.
 
     Args:
         campaign: e.g. "salon_ibargo" or "sanatorio_quiroz"
         sheet_name: target tab name inside the spreadsheet
         headers: ordered list of column names to serialize
-        row: dict keyed by header names
+        rows: list of dicts keyed by header names, in append order
     """
+    if not rows:
+        return
+
     service = _get_sheets_service(campaign)
     spreadsheet_id = get_spreadsheet_id_for_campaign(campaign)
 
     try:
-        result = service.spreadsheets().values().get(
-            spreadsheetId=spreadsheet_id,
-            range=f"{sheet_name}!A:A",
-        ).execute()
+        values = [[row.get(h) for h in headers] for row in rows]
 
-        existing = result.get("values", [])
-        next_row = len(existing) + 1
-
-        values = [[row.get(h) for h in headers]]
-
-        service.spreadsheets().values().update(
+        service.spreadsheets().values().append(
             spreadsheetId=spreadsheet_id,
-            range=f"{sheet_name}!A{next_row}",
+            range=f"{sheet_name}!A:A",
             valueInputOption="USER_ENTERED",
+            insertDataOption="INSERT_ROWS",
             body={"values": values},
         ).execute()
 
         logger.info(
-            "sheet_row_appended campaign=%s spreadsheet_id=%s sheet=%s row=%s",
+            "sheet_rows_appended campaign=%s spreadsheet_id=%s sheet=%s rows=%s",
             campaign,
             spreadsheet_id,
             sheet_name,
-            next_row,
+            len(values),
         )
 
     except Exception as e:
         logger.exception(
-            "Failed to append row campaign=%s spreadsheet_id=%s sheet=%s error=%s",
+            "Failed to append rows campaign=%s spreadsheet_id=%s sheet=%s error=%s",
             campaign,
             spreadsheet_id,
             sheet_name,
@@ -148,6 +161,30 @@ def append_row_to_sheet(
         )
         raise
 
+
+def append_row_to_sheet(
+    *,
+    campaign: str,
+    sheet_name: str,
+    headers: Sequence[str],
+    row: Dict,
+):
+    """
+    Appends one row into the target sheet for the given campaign.
+
+    Args:
+        campaign: e.g. "salon_ibargo" or "sanatorio_quiroz"
+        sheet_name: target tab name inside the spreadsheet
+        headers: ordered list of column names to serialize
+        row: dict keyed by header names
+    """
+    append_rows_to_sheet(
+        campaign=campaign,
+        sheet_name=sheet_name,
+        headers=headers,
+        rows=[row],
+    )
+
 # =====================================================
 # MANUAL TEST
 # =====================================================
@@ -0,0 +1,133 @@
+"""
+shared/openai_utils.py
+--------------------------------
+Client-side throttling shared by every campaign's OpenAI calls.
+
+Without a bound, anything fanning these calls out through
+asyncio.gather (batch reprocessing, traffic spikes) hits the account
+rate limit and degrades into 429s + cascading timeouts. A single
+process-wide semaphore keeps effective concurrency near the limit
+ceiling instead of oscillating around it.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import os
+import time
+from collections import OrderedDict
+
+
+# =====================================================
+# CONFIG
+# =====================================================
+
+OPENAI_MAX_CONCURRENCY = int(os.environ.get("OPENAI_MAX_CONCURRENCY", "16"))
+OPENAI_MAX_RPM = int(os.environ.get("OPENAI_MAX_RPM", "500"))
+OPENAI_MAX_TPM = int(os.environ.get("OPENAI_MAX_TPM", "200000"))
+
+
+# =====================================================
+# CONCURRENCY GATE
+# =====================================================
+
+# One semaphore for the whole process: campaigns share the same OpenAI
+# account, so a per-module limit would still overrun the real quota.
+OAI_SEMAPHORE = asyncio.Semaphore(OPENAI_MAX_CONCURRENCY)
+
+
+# =====================================================
+# RATE LIMITER (leaky bucket)
+# =====================================================
+
+def estimate_tokens(prompt: str, completion_budget: int = 300) -> int:
+    """
+    Cheap token estimate: ~4 chars per token for mixed Spanish/English
+    prose, plus a fixed completion budget. Good enough for admission
+    control; the server enforces the real limit.
+    """
+    return len(prompt) // 4 + completion_budget
+
+
+class RateLimiter:
+    """
+    Admits calls only while both the request-per-minute and
+    token-per-minute buckets have capacity, refilling continuously with
+    elapsed time. Keeps throughput pinned near the account ceiling
+    instead of tripping 429s and paying retry backoff.
+    """
+
+    def __init__(self, max_requests_per_minute: int, max_tokens_per_minute: int):
+        self.max_rpm = float(max_requests_per_minute)
+        self.max_tpm = float(max_tokens_per_minute)
+        self.available_request_capacity = self.max_rpm
+        self.available_token_capacity = self.max_tpm
+        self._last_refill = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        elapsed = now - self._last_refill
+        self._last_refill = now
+
+        self.available_request_capacity = min(
+            self.max_rpm,
+            self.available_request_capacity + elapsed * self.max_rpm / 60.0,
+        )
+        self.available_token_capacity = min(
+            self.max_tpm,
+            self.available_token_capacity + elapsed * self.max_tpm / 60.0,
+        )
+
+    async def acquire(self, token_estimate: int):
+        while True:
+            self._refill()
+
+            if (
+                self.available_request_capacity >= 1.0
+                and self.available_token_capacity >= token_estimate
+            ):
+                self.available_request_capacity -= 1.0
+                self.available_token_capacity -= token_estimate
+                return
+
+            await asyncio.sleep(0.01)
+
+
+OAI_RATE_LIMITER = RateLimiter(OPENAI_MAX_RPM, OPENAI_MAX_TPM)
+
+
+# =====================================================
+# RESPONSE CACHE (exact match)
+# =====================================================
+
+def cache_key(*parts: str) -> str:
+    """Stable content hash for cache keys; keys stay small even when a
+    part is a full transcript."""
+    joined = "\x1f".join(p or "" for p in parts)
+    return hashlib.blake2b(joined.encode(), digest_size=16).hexdigest()
+
+
+class LRUCache:
+    """
+    Tiny in-process LRU for LLM outputs. Retries and repeated inputs
+    (identical transcripts, common date phrases) return in microseconds
+    instead of a 500-2000 ms network round-trip.
+    """
+
+    def __init__(self, maxsize: int = 4096):
+        self.maxsize = maxsize
+        self._data: OrderedDict = OrderedDict()
+
+    def get(self, key: str):
+        try:
+            self._data.move_to_end(key)
+            return self._data[key]
+        except KeyError:
+            return None
+
+    def put(self, key: str, value):
+        self._data[key] = value
+        self._data.move_to_end(key)
+        if len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
@@ -1,7 +1,7 @@
 import logging
 from datetime import datetime
-from fastapi import Request, HTTPException
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel, Field
 
 from .vg_consultoria_ai_utils import normalize_visit_datetime_pst
 from shared.google_calendar import is_slot_available
@@ -25,26 +25,71 @@ BUSINESS_HOUR_END = 16    # 4:00 PM (last appointment must START before this)
 
 
 # =====================================================
-# BASE FIELD VALIDATION
+# REQUEST MODEL
 # =====================================================
+# Validation runs in pydantic-core (Rust) during FastAPI's body parse;
+# missing/empty fields come back as automatic 422s.
 
-def extract_base_fields(payload: dict):
-    conversation_id = payload.get("conversation_id")
-    channel = payload.get("channel")
+class AgendarCitaDisponibilidadIn(BaseModel):
+    conversation_id: str = Field(min_length=1)
+    channel: str = Field(min_length=1)
+    name: str = Field(min_length=1)
+    visit_date: str = Field(min_length=1)
+    visit_time: str = Field(min_length=1)
+    purpose: str | None = None
 
-    if not conversation_id:
-        raise HTTPException(
-            status_code=400,
-            detail="conversation_id is required",
-        )
-
-    if not channel:
-        raise HTTPException(
-            status_code=400,
-            detail="channel is required",
-        )
 
-    return conversation_id, channel
+# =====================================================
+# STATIC REJECTION RESPONSES
+# =====================================================
+# Every rejection body is fixed at import time, so each one is encoded
+# once here instead of re-serialized on every rejected request.
+
+_REJECT_AMBIGUOUS_DATETIME = ORJSONResponse(
+    {
+        "status": "rejected",
+        "reason": "ambiguous_datetime",
+        "message": (
+            "No pude entender la fecha u hora con certeza. "
+            "Podrias repetirme exactamente que dia y a que hora te gustaria?"
+        ),
+    },
+    status_code=200,
+)
+
+_REJECT_OUTSIDE_BUSINESS_HOURS = ORJSONResponse(
+    {
+        "status": "rejected",
+        "reason": "outside_business_hours",
+        "message": (
+            f"Lo siento, nuestro horario de atencion es de "
+            f"{BUSINESS_HOUR_START}:00 a {BUSINESS_HOUR_END}:00. "
+            f"Te gustaria agendar dentro de ese horario?"
+        ),
+    },
+    status_code=200,
+)
+
+_REJECT_CALENDAR_CHECK_FAILED = ORJSONResponse(
+    {
+        "status": "rejected",
+        "reason": "calendar_check_failed",
+        "message": (
+            "No pude verificar la disponibilidad en este momento. "
+            "Podrias intentarlo de nuevo en un momento?"
+        ),
+    },
+    status_code=200,
+)
+
+_REJECT_SLOT_UNAVAILABLE = ORJSONResponse(
+    {
+        "status": "rejected",
+        "reason": "slot_unavailable",
+        "message": "Esa hora ya esta ocupada. Te gustaria proponer otro horario?",
+    },
+    status_code=200,
+)
 
 
 # =====================================================
@@ -64,45 +109,24 @@ def _is_within_business_hours(visit_date: str, visit_time: str) -> bool:
 # ACTION: agendar_cita_disponibilidad
 # =====================================================
 
-async def agendar_cita_disponibilidad_endpoint(request: Request):
-
-    payload = await request.json()
-    logger.info("[agendar_cita_disponibilidad] RAW PAYLOAD: %s", payload)
+async def agendar_cita_disponibilidad_endpoint(payload: AgendarCitaDisponibilidadIn):
 
-    conversation_id, channel = extract_base_fields(payload)
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("[agendar_cita_disponibilidad] RAW PAYLOAD: %s", payload)
 
-    name = payload.get("name")
-    visit_date = payload.get("visit_date")
-    visit_time = payload.get("visit_time")
-    purpose = payload.get("purpose")  # optional
-
-    if not all([name, visit_date, visit_time]):
-        raise HTTPException(
-            status_code=400,
-            detail="name, visit_date, and visit_time are required",
-        )
+    name = payload.name
 
     # ---------------------------------------------------------
     # 1. Normalize fuzzy date/time
     # ---------------------------------------------------------
     normalized = await normalize_visit_datetime_pst(
-        visit_date=visit_date,
-        visit_time=visit_time,
+        visit_date=payload.visit_date,
+        visit_time=payload.visit_time,
     )
 
     if normalized.get("confidence") != "high":
         logger.info("Visit date/time could not be confidently normalized")
-        return JSONResponse(
-            {
-                "status": "rejected",
-                "reason": "ambiguous_datetime",
-                "message": (
-                    "No pude entender la fecha u hora con certeza. "
-                    "Podrias repetirme exactamente que dia y a que hora te gustaria?"
-                ),
-            },
-            status_code=200,
-        )
+        return _REJECT_AMBIGUOUS_DATETIME
 
     norm_date = normalized["visit_date"]
     norm_time = normalized["visit_time"]
@@ -116,18 +140,7 @@ async def agendar_cita_disponibilidad_endpoint(request: Request):
             norm_date,
             norm_time,
         )
-        return JSONResponse(
-            {
-                "status": "rejected",
-                "reason": "outside_business_hours",
-                "message": (
-                    f"Lo siento, nuestro horario de atencion es de "
-                    f"{BUSINESS_HOUR_START}:00 a {BUSINESS_HOUR_END}:00. "
-                    f"Te gustaria agendar dentro de ese horario?"
-                ),
-            },
-            status_code=200,
-        )
+        return _REJECT_OUTSIDE_BUSINESS_HOURS
 
     # ---------------------------------------------------------
     # 3. Google Calendar availability check
@@ -141,17 +154,7 @@ async def agendar_cita_disponibilidad_endpoint(request: Request):
         )
     except Exception:
         logger.exception("Calendar availability check failed")
-        return JSONResponse(
-            {
-                "status": "rejected",
-                "reason": "calendar_check_failed",
-                "message": (
-                    "No pude verificar la disponibilidad en este momento. "
-                    "Podrias intentarlo de nuevo en un momento?"
-                ),
-            },
-            status_code=200,
-        )
+        return _REJECT_CALENDAR_CHECK_FAILED
 
     if not availability["available"]:
         logger.info(
@@ -160,33 +163,26 @@ async def agendar_cita_disponibilidad_endpoint(request: Request):
             norm_time,
             len(availability["conflicts"]),
         )
-        return JSONResponse(
-            {
-                "status": "rejected",
-                "reason": "slot_unavailable",
-                "message": "Esa hora ya esta ocupada. Te gustaria proponer otro horario?",
-            },
-            status_code=200,
-        )
+        return _REJECT_SLOT_UNAVAILABLE
 
     # ---------------------------------------------------------
     # 4. Confirm
     # ---------------------------------------------------------
     visit = {
         "name": name,
-        "purpose": purpose,
+        "purpose": payload.purpose,
         "visit_date": norm_date,
         "visit_time": norm_time,
     }
 
     logger.info(
         "agendar_cita | conversation_id=%s channel=%s visit=%s",
-        conversation_id,
-        channel,
+        payload.conversation_id,
+        payload.channel,
         visit,
     )
 
-    return JSONResponse(
+    return ORJSONResponse(
         {
             "status": "confirmed",
             "confirmed_visit": visit,
@@ -1,3 +1,4 @@
+import asyncio
 import logging
 import os
 from datetime import datetime
@@ -9,7 +10,7 @@ from vg_consultoria.vg_consultoria_ai_utils import (
     summarize_transcript,
     transcript_to_single_line,
 )
-from shared.gsheet_utils import append_row_to_sheet
+from shared.gsheet_batcher import enqueue_row
 from shared.google_calendar import create_event
 
 # =====================================================
@@ -23,13 +24,17 @@ logger = logging.getLogger("vg_consultoria_after_conversation")
 # =====================================================
 
 PST = ZoneInfo("America/Los_Angeles")
+
+# Bound once at import: skips the datetime attribute lookup on the two
+# parses every request does.
+_fromisoformat = datetime.fromisoformat
 CAMPAIGN = "vg_consultoria"
 
 # =====================================================
 # SHEET HEADERS (MATCH GOOGLE SHEETS EXACTLY)
 # =====================================================
 
-CALL_HEADERS = [
+CALL_HEADERS = (
     "Creado",
     "From Phone Number",
     "To Phone Number",
@@ -41,7 +46,7 @@ CALL_HEADERS = [
     "Grabación",
     "Appointment Requested",
     "ID",
-]
+)
 
 # =====================================================
 # AFTER CONVERSATION HANDLER
@@ -50,7 +55,8 @@ CALL_HEADERS = [
 async def handle_vg_consultoria_after_call(request: Request):
     payload = await request.json()
 
-    logger.info("[handle_vg_consultoria_after_call] RAW PAYLOAD: %s", payload)
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("[handle_vg_consultoria_after_call] RAW PAYLOAD: %s", payload)
 
     # -------------------------------------------------
     # REQUIRED FIELDS
@@ -76,15 +82,10 @@ async def handle_vg_consultoria_after_call(request: Request):
     # PARSE TIMESTAMPS
     # -------------------------------------------------
 
-    conversation_started_at = datetime.strptime(
-        started_str,
-        "%Y-%m-%d %H:%M:%S",
-    ).replace(tzinfo=PST)
-
-    conversation_ended_at = datetime.strptime(
-        ended_str,
-        "%Y-%m-%d %H:%M:%S",
-    ).replace(tzinfo=PST)
+    # fromisoformat handles "YYYY-MM-DD HH:MM:SS" directly and is a C
+    # fast path, unlike strptime which re-parses the format every call.
+    conversation_started_at = _fromisoformat(started_str).replace(tzinfo=PST)
+    conversation_ended_at = _fromisoformat(ended_str).replace(tzinfo=PST)
 
     duration = int(
         (conversation_ended_at - conversation_started_at).total_seconds()
@@ -94,16 +95,27 @@ async def handle_vg_consultoria_after_call(request: Request):
     # SUMMARIZE TRANSCRIPT
     # -------------------------------------------------
 
-    if transcript:
-        summary = await summarize_transcript(transcript)
-    else:
-        summary = "Llamada Fantasma 👻"
+    # Kick the LLM call off first; the transcript flattening and
+    # timestamp formatting below run while it is in flight.
+    summary_task = (
+        asyncio.create_task(summarize_transcript(transcript))
+        if transcript
+        else None
+    )
 
     single_line_transcript = transcript_to_single_line(transcript)
 
-    created_str = conversation_ended_at.strftime("%Y-%m-%d %H:%M:%S")
-    started_fmt = conversation_started_at.strftime("%Y-%m-%d %H:%M:%S")
-    ended_fmt = conversation_ended_at.strftime("%Y-%m-%d %H:%M:%S")
+    # Format each datetime exactly once; "Creado" mirrors the end time.
+    started_fmt = f"{conversation_started_at:%Y-%m-%d %H:%M:%S}"
+    ended_fmt = f"{conversation_ended_at:%Y-%m-%d %H:%M:%S}"
+    created_str = ended_fmt
+
+    summary = (
+        await summary_task
+        if summary_task is not None
+        else "Llamada Fantasma 👻"
+    )
+
     appointment_str = "Si" if appointment_requested else "No"
 
     # -------------------------------------------------
@@ -154,7 +166,7 @@ async def handle_vg_consultoria_after_call(request: Request):
         "ID": conversation_id,
     }
 
-    append_row_to_sheet(
+    await enqueue_row(
         campaign=CAMPAIGN,
         sheet_name=sheet_name,
         headers=headers,